@@ -0,0 +1,91 @@
+# ennchan_search_dev/ennchan_search/cli.py
+import argparse
+import logging
+import signal
+import threading
+from typing import Optional, List
+
+from ennchan_search.server import SearchService, create_server
+
+logger = logging.getLogger(__name__)
+
+def _positive_int(value: str) -> int:
+    """Parse a strictly positive integer argument."""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Run the resident search service until interrupted.
+
+    SIGINT and SIGTERM stop accepting new connections, close idle
+    keep-alive connections, wait for in-flight requests to finish and then
+    release the shared pools. A second signal exits immediately.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Process exit code
+    """
+    service = SearchService(
+        args.config,
+        max_pending=args.max_pending,
+        batch_workers=args.batch_workers,
+        memory_budget=args.memory_budget * 1024 * 1024 if args.memory_budget is not None else None
+    )
+    server = create_server(service, host=args.host, port=args.port)
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}, shutting down (signal again to force exit)")
+        # A second signal falls back to the default action and exits at once
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        server.close_idle_connections()
+        # shutdown() blocks until serve_forever returns, so call it off-thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    host, port = server.server_address[:2]
+    logger.info(f"Serving ennchan-search on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.close_idle_connections()
+        server.server_close()
+        service.close()
+        logger.info("Search service stopped")
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for the ennchan-search command."""
+    parser = argparse.ArgumentParser(prog="ennchan-search")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run a local HTTP search service")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Port to bind")
+    serve_parser.add_argument("--config", default=None, help="Path to a config.json file")
+    serve_parser.add_argument(
+        "--max-pending", type=_positive_int, default=32,
+        help="Requests processed at once before rejecting with 503"
+    )
+    serve_parser.add_argument(
+        "--batch-workers", type=_positive_int, default=4,
+        help="Queries of a batch searched concurrently"
+    )
+    serve_parser.add_argument(
+        "--memory-budget", type=_positive_int, default=None,
+        help="Megabytes of page data held in flight before fetches wait"
+    )
+    serve_parser.set_defaults(func=serve)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,3 +2,4 @@
 
 from ennchan_search.core.model import BraveSearchEngine
 from ennchan_search.core.interfaces import SearchEngine, ResultExtractor
+from ennchan_search.core.results import LazyResult
@@ -9,9 +9,13 @@ import concurrent.futures
 from requests.exceptions import RequestException
 
 from ennchan_search.core.interfaces import SearchEngine
-from ennchan_search.extractor.extractorModel import WebResultExtractor
+from ennchan_search.core.results import LazyContent, LazyResult
+from ennchan_search.extractor.extractorModel import WebResultExtractor, create_session
+from ennchan_search.extractor.templates import ExtractionTemplateCache, default_template_cache
 from ennchan_search.config import Config, load_config
 from ennchan_search.utils.error_handling import retry_with_backoff, safe_dict_get
+from ennchan_search.utils.single_flight import SingleFlight
+from ennchan_search.utils.memory_budget import ByteBudget, default_byte_budget
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +25,34 @@ class BraveSearchEngine(SearchEngine):
     
     This class provides search functionality using the Brave Search API
     and handles content extraction from search results.
+    
+    Concurrent identical searches and page fetches are coalesced
+    process-wide, so every engine instance shares the same in-flight work.
+    Lazy-mode prefetches also run on one process-wide thread pool.
     """
     
-    def __init__(self, config: Optional[Union[str, Dict, Config]] = None):
+    _search_flight = SingleFlight()
+    _extract_flight = SingleFlight()
+    _prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=5, thread_name_prefix="ennchan-prefetch"
+    )
+    
+    def __init__(
+        self,
+        config: Optional[Union[str, Dict, Config]] = None,
+        templates: Optional[ExtractionTemplateCache] = None,
+        budget: Optional[ByteBudget] = None
+    ):
         """
         Initialize the Brave Search engine.
         
         Args:
             config: Configuration for the search engine. Can be a path to a config file,
                    a dictionary, a Config object, or None to use environment variables.
+            templates: Per-domain extraction template cache. Defaults to the
+                   process-wide cache shared by all engines.
+            budget: Byte budget limiting page data in flight. Defaults to the
+                   process-wide budget shared by all engines.
         """
         # Handle different config types
         if isinstance(config, str):
@@ -58,20 +81,69 @@ class BraveSearchEngine(SearchEngine):
         else:
             self.brave = Brave()
             logger.warning("Initialized Brave Search without API key")
+        
+        # Shared HTTP connection pool for all page fetches of this engine
+        self.session = create_session()
+        self.templates = templates or default_template_cache()
+        self.budget = budget or default_byte_budget()
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Normalize a query so trivially different spellings coalesce."""
+        return " ".join(query.lower().split())
+
+    def coalescing_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get single-flight coalescing metrics.
+        
+        Returns:
+            Counters for the search and extraction levels
+        """
+        return {
+            "search": self._search_flight.stats(),
+            "extract": self._extract_flight.stats(),
+        }
+
+    def memory_stats(self) -> Dict[str, Any]:
+        """
+        Get in-flight byte budget gauges.
+        
+        Returns:
+            Current and peak usage, waits and time spent on backpressure
+        """
+        return self.budget.stats()
+
+    def template_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-domain extraction template metrics.
+        
+        Returns:
+            Mapping of domain to its learned selector and hit rate
+        """
+        return self.templates.stats()
 
     def extract_content(self, url: str) -> Optional[str]:
         """
         Extract main content from a URL with improved error handling.
         
+        Concurrent calls for the same URL share a single fetch.
+        
         Args:
             url: The URL to extract content from
             
         Returns:
             Extracted content as string or None if extraction fails
         """
+        return self._extract_flight.do(url, self._extract_content, url)
+
+    def _extract_content(self, url: str) -> Optional[str]:
+        """Fetch and extract content from a URL without coalescing."""
         try:
             logger.info(f"Extracting content from {url}")
-            output = WebResultExtractor(url)
+            output = WebResultExtractor(
+                url, session=self.session, templates=self.templates,
+                budget=self.budget
+            )
             content = output.request_content()
             
             if not content:
@@ -96,32 +168,10 @@ class BraveSearchEngine(SearchEngine):
             List of processed search results with extracted content
         """
         try:
-            # Safely get results using helper function
-            web_results = safe_dict_get(results, 'web.results', [])
-            
-            if not web_results:
-                logger.warning("No web results found in search response")
+            pre_proc = self._pre_process_results(results)
+            if not pre_proc:
                 return []
             
-            # Extract important fields with defensive programming
-            pre_proc = []
-            for result in web_results:
-                if not isinstance(result, dict):
-                    continue
-                    
-                item = {
-                    "title": result.get("title", "Untitled"),
-                    "url": result.get("url", ""),
-                    "description": result.get("description", "")
-                }
-                
-                # Skip items without URL
-                if not item["url"]:
-                    logger.warning("Skipping result with no URL")
-                    continue
-                    
-                pre_proc.append(item)
-            
             logger.info(f"Processing {len(pre_proc)} search results")
             
             # Extract content from each URL in parallel
@@ -151,6 +201,77 @@ class BraveSearchEngine(SearchEngine):
             logger.error(f"Error processing search results: {e}")
             return []
 
+    def lazy_results(self, results: Dict[str, Any], prefetch: int = 0) -> List[LazyResult]:
+        """
+        Wrap search results without fetching any page content.
+        
+        Each result's content is fetched on first access through the shared
+        session, coalescing, templates and byte budget. Results that are
+        never read cost no fetch.
+        
+        Args:
+            results: Raw search results from the Brave API
+            prefetch: Number of top results to start fetching in the background
+            
+        Returns:
+            List of results whose content is resolved lazily
+        """
+        try:
+            output = [
+                LazyResult(item, LazyContent(self.extract_content, item["url"]))
+                for item in self._pre_process_results(results)
+            ]
+        except Exception as e:
+            logger.error(f"Error processing search results: {e}")
+            return []
+        
+        self._prefetch(output, prefetch)
+        return output
+
+    def _prefetch(self, results: List[Dict[str, Any]], count: int):
+        """Start background fetches for the first count lazy results."""
+        for result in results[:max(0, count)]:
+            if isinstance(result, LazyResult):
+                result.prefetch(self._prefetch_executor)
+
+    def _pre_process_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Extract the title, URL and description of each web result.
+        
+        Args:
+            results: Raw search results from the Brave API
+            
+        Returns:
+            List of result items that have a URL
+        """
+        # Safely get results using helper function
+        web_results = safe_dict_get(results, 'web.results', [])
+        
+        if not web_results:
+            logger.warning("No web results found in search response")
+            return []
+        
+        # Extract important fields with defensive programming
+        pre_proc = []
+        for result in web_results:
+            if not isinstance(result, dict):
+                continue
+                
+            item = {
+                "title": result.get("title", "Untitled"),
+                "url": result.get("url", ""),
+                "description": result.get("description", "")
+            }
+            
+            # Skip items without URL
+            if not item["url"]:
+                logger.warning("Skipping result with no URL")
+                continue
+                
+            pre_proc.append(item)
+        
+        return pre_proc
+
     def _process_single_url(self, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Process a single URL with error handling.
@@ -189,16 +310,23 @@ class BraveSearchEngine(SearchEngine):
             logger.error(f"Error processing URL {url}: {e}")
             return None
 
-    @retry_with_backoff(max_retries=5, initial_delay=1.0, backoff_factor=2.0)
-    def search(self, query: str) -> List[Dict[str, Any]]:
+    def search(self, query: str, lazy: bool = False, prefetch: int = 0) -> List[Dict[str, Any]]:
         """
         Search with improved error handling and retries.
         
         This method performs a search using the Brave API with
-        automatic retries and comprehensive error handling.
+        automatic retries and comprehensive error handling. Concurrent
+        searches for the same normalized query share one execution.
+        
+        In lazy mode the method returns right after the Brave call and
+        every result's content is fetched on first access. Unlike the
+        eager mode, results whose content cannot be extracted are kept
+        with empty content.
         
         Args:
             query: The search query string
+            lazy: Return LazyResult items instead of fetching every page
+            prefetch: In lazy mode, number of top results to fetch in the background
             
         Returns:
             List of search results with extracted content
@@ -209,7 +337,18 @@ class BraveSearchEngine(SearchEngine):
         if not query or not query.strip():
             logger.warning("Empty query provided")
             return []
-            
+        
+        key = (self.api_key, self._normalize_query(query), lazy)
+        results = self._search_flight.do(key, self._search, query, lazy)
+        # Give each caller its own copies of the shared result dicts
+        results = [item.copy() for item in results]
+        if lazy:
+            self._prefetch(results, prefetch)
+        return results
+
+    @retry_with_backoff(max_retries=5, initial_delay=1.0, backoff_factor=2.0)
+    def _search(self, query: str, lazy: bool = False) -> List[Dict[str, Any]]:
+        """Perform a search against the Brave API without coalescing."""
         try:
             logger.info(f"Searching for: {query}")
             search_results = self.brave.search(q=query, raw=True)
@@ -228,6 +367,8 @@ class BraveSearchEngine(SearchEngine):
                 return []
                 
             # Process results
+            if lazy:
+                return self.lazy_results(search_results)
             return self.process_results(search_results)
             
         except Exception as e:
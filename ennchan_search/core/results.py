@@ -0,0 +1,187 @@
+# ennchan_search_dev/ennchan_search/core/results.py
+import copy
+import logging
+import threading
+import concurrent.futures
+from collections.abc import ItemsView, KeysView, ValuesView
+from typing import Callable, Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+class LazyContent:
+    """
+    Page content fetched at most once, on first access or by prefetch.
+
+    Copies of a lazy result share the same LazyContent, so the page is
+    fetched once no matter how many copies read it.
+    """
+
+    def __init__(self, fetch: Callable[[str], Optional[str]], url: str):
+        """
+        Initialize the lazy content.
+
+        Args:
+            fetch: Function extracting content from a URL
+            url: The URL to fetch
+        """
+        self.url = url
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._future: Optional[concurrent.futures.Future] = None
+
+    def resolve(self) -> str:
+        """
+        Get the content, fetching it if nobody has yet.
+
+        Returns:
+            Extracted content or empty string if extraction failed
+        """
+        with self._lock:
+            owner = self._future is None
+            if owner:
+                self._future = self._start()
+            future = self._future
+
+        if owner:
+            self._run(future)
+        return future.result()
+
+    def prefetch(self, executor: concurrent.futures.Executor):
+        """Start resolving the content in the background, unless a fetch has started."""
+        with self._lock:
+            if self._future is not None:
+                return
+            future = self._future = self._start()
+        try:
+            executor.submit(self._run, future)
+        except BaseException as e:
+            # Nobody will run the fetch, so let later reads start their own
+            with self._lock:
+                self._future = None
+            future.set_exception(e)
+            raise
+
+    @staticmethod
+    def _start() -> concurrent.futures.Future:
+        """Create the future of a fetch that is about to run."""
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        return future
+
+    def _run(self, future: concurrent.futures.Future):
+        """Fetch the content into the given future."""
+        try:
+            future.set_result(self._fetch(self.url) or "")
+        except BaseException as e:
+            future.set_exception(e)
+
+    def done(self) -> bool:
+        """Whether the content has already been fetched."""
+        with self._lock:
+            return self._future is not None and self._future.done()
+
+
+class LazyResult(dict):
+    """
+    Search result whose ``content`` is fetched on first access.
+
+    Title, URL and description are available immediately. "content" is
+    always one of the result's keys, but its value is only fetched when it
+    is first read, through indexing, ``get``, ``items``/``values``,
+    ``dict(result)``, ``json.dumps`` or the ``content`` property. Results
+    whose content is never read cost no fetch. Pickling resolves the
+    content and produces a plain dictionary.
+    """
+
+    def __init__(self, item: Dict[str, Any], content: LazyContent):
+        """
+        Initialize the lazy result.
+
+        Args:
+            item: Result fields known without fetching the page
+            content: Lazily fetched page content
+        """
+        super().__init__(item)
+        self._content = content
+
+    def __missing__(self, key: str) -> Any:
+        if key != "content":
+            raise KeyError(key)
+        value = self._content.resolve()
+        self["content"] = value
+        return value
+
+    def _pending(self) -> bool:
+        """Whether "content" is still a virtual key."""
+        return not super().__contains__("content")
+
+    def __contains__(self, key: object) -> bool:
+        return key == "content" or super().__contains__(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from super().__iter__()
+        if self._pending():
+            yield "content"
+
+    def __len__(self) -> int:
+        return super().__len__() + (1 if self._pending() else 0)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, dict):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = dict(super().items())
+        if self._pending():
+            return f"LazyResult({fields!r}, content=<not fetched>)"
+        return f"LazyResult({fields!r})"
+
+    def keys(self) -> KeysView:
+        return KeysView(self)
+
+    def items(self) -> ItemsView:
+        return ItemsView(self)
+
+    def values(self) -> ValuesView:
+        return ValuesView(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a field, fetching the content if it is requested."""
+        if key == "content":
+            return self["content"]
+        return super().get(key, default)
+
+    def copy(self) -> "LazyResult":
+        """Copy the result, sharing the same lazy content."""
+        return LazyResult(dict(super().items()), self._content)
+
+    def __copy__(self) -> "LazyResult":
+        return self.copy()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LazyResult":
+        # The fetched content is an immutable string, so sharing it is safe
+        return LazyResult(copy.deepcopy(dict(super().items()), memo), self._content)
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    @property
+    def content(self) -> str:
+        """The page content, fetched on first access."""
+        return self["content"]
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the content has already been fetched."""
+        return self._content.done()
+
+    def prefetch(self, executor: concurrent.futures.Executor):
+        """Start fetching the content in the background."""
+        self._content.prefetch(executor)
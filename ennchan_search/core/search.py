@@ -6,13 +6,20 @@ from ennchan_search.core.model import BraveSearchEngine
 
 logger = logging.getLogger(__name__)
 
-def search(query: str, config: Optional[Union[str, Dict]]=None) -> List[Dict[str, Any]]:
+def search(
+    query: str,
+    config: Optional[Union[str, Dict]]=None,
+    lazy: bool = False,
+    prefetch: int = 0
+) -> List[Dict[str, Any]]:
     """
     Search the web with improved error handling.
     
     Args:
         query: Search query
         config: Optional configuration
+        lazy: Fetch each result's content only when it is first accessed
+        prefetch: In lazy mode, number of top results to fetch in the background
         
     Returns:
         List of search results with content
@@ -24,7 +31,7 @@ def search(query: str, config: Optional[Union[str, Dict]]=None) -> List[Dict[str
             
         logger.info(f"Initiating search for: {query}")
         engine = BraveSearchEngine(config)
-        results = engine.search(query)
+        results = engine.search(query, lazy=lazy, prefetch=prefetch)
         
         logger.info(f"Search completed with {len(results)} results")
         return results
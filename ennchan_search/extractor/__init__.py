@@ -1,3 +1,4 @@
 """Content extraction functionality."""
 
-from ennchan_search.extractor.extractorModel import WebResultExtractor
+from ennchan_search.extractor.extractorModel import WebResultExtractor, create_session
+from ennchan_search.extractor.templates import ExtractionTemplateCache, default_template_cache
@@ -1,15 +1,200 @@
 # ennchan_search_dev/ennchan_search/extractor/extractorModel.py
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import logging
+from typing import Optional
 
 from ennchan_search.core.interfaces import ResultExtractor
+from ennchan_search.extractor.templates import ExtractionTemplateCache, container_selector
 from ennchan_search.utils.error_handling import retry_with_backoff
+from ennchan_search.utils.memory_budget import ByteBudget, BudgetExceeded
 
 logger = logging.getLogger(__name__)
 
+
+class _ParagraphTarget:
+    """
+    lxml parser target that keeps only paragraph text.
+
+    Events are consumed as the parser is fed, so no element tree is ever
+    built. Ignored subtrees are skipped entirely, and the strings kept
+    mirror what ``process_result`` gathers from the BeautifulSoup tree.
+
+    One difference remains: lxml closes an open ``<p>`` when a block
+    element or another ``<p>`` starts, as browsers do, while html.parser
+    nests them. Text after such a block is therefore not part of the
+    paragraph, and a nested paragraph is kept once instead of twice.
+
+    When a container selector is given, paragraphs inside the first
+    matching element are also collected separately. The whole document is
+    still parsed, since a later element may match the selector too;
+    ``container_text`` only returns the container's text when it was the
+    single match.
+    """
+
+    def __init__(self, ignore_tags, min_length: int = 30, container: Optional[str] = None):
+        self.ignore_tags = set(ignore_tags)
+        self.min_length = min_length
+        self.container = container
+        self.paragraphs = []
+        self.container_paragraphs = []
+        self.body_strings = []
+        self.all_strings = []
+        self._buffer = []
+        self._paragraph_parts = []
+        self._ignore_depth = 0
+        self._paragraph_depth = 0
+        self._body_depth = 0
+        # Open elements as (uid, selector, is_container) tuples
+        self._stack = []
+        self._next_uid = 0
+        self._in_container = False
+        self._container_closed = False
+        self._common_path = None
+        # Occurrences of each selector, so only unique containers are learned
+        self._selector_counts = {}
+
+    def start(self, tag, attrib):
+        self._flush()
+        if self._ignore_depth or tag in self.ignore_tags:
+            self._ignore_depth += 1
+            return
+
+        selector = container_selector(tag, attrib)
+        if selector:
+            self._selector_counts[selector] = self._selector_counts.get(selector, 0) + 1
+        is_container = (
+            self.container is not None
+            and not self._in_container
+            and not self._container_closed
+            and selector == self.container
+        )
+        if is_container:
+            self._in_container = True
+        self._stack.append((self._next_uid, selector, is_container))
+        self._next_uid += 1
+
+        if tag == 'p':
+            self._paragraph_depth += 1
+        elif tag == 'body':
+            self._body_depth += 1
+
+    def end(self, tag):
+        self._flush()
+        if self._ignore_depth:
+            self._ignore_depth -= 1
+            return
+
+        _, _, is_container = self._stack.pop() if self._stack else (None, None, False)
+        if tag == 'p' and self._paragraph_depth:
+            self._paragraph_depth -= 1
+            if not self._paragraph_depth:
+                self._end_paragraph()
+        elif tag == 'body' and self._body_depth:
+            self._body_depth -= 1
+
+        if is_container:
+            self._in_container = False
+            self._container_closed = True
+
+    def data(self, data):
+        if not self._ignore_depth:
+            self._buffer.append(data)
+
+    def comment(self, text):
+        # Comments split the surrounding text into separate strings
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return self.text()
+
+    def text(self) -> str:
+        """Build the final text using the same fallbacks as process_result."""
+        text = '\n\n'.join(self.paragraphs)
+        if not text:
+            text = '\n'.join(self.body_strings)
+        if not text:
+            text = '\n'.join(self.all_strings)
+        return text
+
+    def container_text(self) -> Optional[str]:
+        """Text of the container, or None if it did not match exactly one element."""
+        if self.container is None or self._selector_counts.get(self.container) != 1:
+            return None
+        return '\n\n'.join(self.container_paragraphs) or None
+
+    def main_container(self) -> Optional[str]:
+        """Selector of the closest uniquely identifiable common ancestor of kept paragraphs."""
+        for _, selector in reversed(self._common_path or ()):
+            if selector and self._selector_counts.get(selector) == 1:
+                return selector
+        return None
+
+    def _end_paragraph(self):
+        """Keep a finished paragraph if it is long enough."""
+        text = ''.join(self._paragraph_parts)
+        self._paragraph_parts = []
+        if len(text) <= self.min_length:
+            return
+
+        self.paragraphs.append(text)
+        if self._in_container:
+            self.container_paragraphs.append(text)
+        # Fallback strings are no longer needed once a paragraph has been kept
+        self.body_strings = []
+        self.all_strings = []
+
+        path = [(uid, selector) for uid, selector, _ in self._stack]
+        if self._common_path is None:
+            self._common_path = path
+        else:
+            common = 0
+            for mine, theirs in zip(self._common_path, path):
+                if mine != theirs:
+                    break
+                common += 1
+            del self._common_path[common:]
+
+    def _flush(self):
+        """Turn buffered character data into one stripped string."""
+        if not self._buffer:
+            return
+        text = ''.join(self._buffer).strip()
+        self._buffer = []
+        if not text:
+            return
+        if self._paragraph_depth:
+            self._paragraph_parts.append(text)
+        if not self.paragraphs:
+            if self._body_depth:
+                self.body_strings.append(text)
+            self.all_strings.append(text)
+
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session with retry capabilities.
+    
+    Sessions keep a connection pool, so one session can be shared by many
+    extractors to reuse connections across fetches.
+    """
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,  # Total number of retries
+        backoff_factor=0.5,  # Backoff factor
+        status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
+        allowed_methods=["GET"]  # Only retry on GET requests
+    )
+    adapter = HTTPAdapter(max_retries=retry_strategy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class WebResultExtractor(ResultExtractor):
     """
     Extracts content from web pages.
@@ -18,31 +203,37 @@ class WebResultExtractor(ResultExtractor):
     the main textual content while filtering out non-content elements.
     """
     
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        session: Optional[requests.Session] = None,
+        templates: Optional[ExtractionTemplateCache] = None,
+        budget: Optional[ByteBudget] = None
+    ):
         """
         Initialize the web content extractor.
         
         Args:
             url: The URL to extract content from
+            session: Optional shared session to reuse pooled connections
+            templates: Optional per-domain extraction template cache
+            budget: Optional shared byte budget limiting page data in flight
         """
         self.url = url
         self.result = ""
         self.ignore_tags = ['script', 'style', 'nav', 'header', 'footer']
-        self.session = self._create_session()
+        self.chunk_size = 16384
+        # Bytes reserved for kept text when the response size is unknown,
+        # and the most parsed for a single page
+        self.page_estimate = 262144
+        self.max_page_bytes = 4194304
+        self.session = session or self._create_session()
+        self.templates = templates
+        self.budget = budget
     
     def _create_session(self):
         """Create a requests session with retry capabilities"""
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,  # Total number of retries
-            backoff_factor=0.5,  # Backoff factor
-            status_forcelist=[429, 500, 502, 503, 504],  # Retry on these status codes
-            allowed_methods=["GET"]  # Only retry on GET requests
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
+        return create_session()
 
     @retry_with_backoff(max_retries=3, exceptions=(requests.RequestException,))
     def request_content(self) -> str:
@@ -62,12 +253,31 @@ class WebResultExtractor(ResultExtractor):
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = self.session.get(self.url, timeout=15, headers=headers)
-            response.raise_for_status()
-            
-            self.result = response.text
-            return self.process_result()
+            response = self.session.get(self.url, timeout=15, headers=headers, stream=True)
+
+            # Parse chunks as they arrive instead of waiting for the full body.
+            # Error responses are closed too so their connection is reused.
+            with response:
+                response.raise_for_status()
+                # Only one chunk and the kept text are held while parsing, so
+                # reserve an estimate of that before reading the body and grow
+                # it if the page turns out larger. The download's bytes are
+                # released once parsed.
+                reservation = self.budget.reservation() if self.budget else None
+                try:
+                    if reservation:
+                        reservation.resize(self.chunk_size + self._text_estimate(response))
+                    chunks = self._metered_chunks(
+                        response.iter_content(chunk_size=self.chunk_size), reservation
+                    )
+                    return self.process_stream(chunks, encoding=response.encoding)
+                finally:
+                    if reservation:
+                        reservation.release()
         
+        except BudgetExceeded as e:
+            logger.warning(f"Shedding {self.url}, memory budget is full: {e}")
+            return ""
         except requests.RequestException as e:
             logger.error(f"Request error for {self.url}: {e}")
             raise  # Re-raise for retry decorator
@@ -75,12 +285,56 @@ class WebResultExtractor(ResultExtractor):
             logger.error(f"Unexpected error processing {self.url}: {e}")
             return ""
 
+    def _text_estimate(self, response) -> int:
+        """
+        Initial estimate of the text kept for a page.
+
+        Content-Length is only used for uncompressed bodies, since it counts
+        the encoded bytes otherwise. The estimate may still be short, so
+        ``_metered_chunks`` grows the reservation with the bytes parsed.
+        """
+        length = response.headers.get('Content-Length', '')
+        if length.isdigit() and not response.headers.get('Content-Encoding'):
+            size = int(length)
+        else:
+            size = self.page_estimate
+        return min(size, self.max_page_bytes)
+
+    def _metered_chunks(self, chunks, reservation=None):
+        """
+        Yield decoded body chunks, keeping the reservation above what was parsed.
+
+        Reading stops once ``max_page_bytes`` have been parsed, so a page
+        never holds more than that however large its body is.
+
+        Args:
+            chunks: Iterable of decoded HTML byte chunks
+            reservation: Optional reservation to grow as bytes are parsed
+
+        Yields:
+            The chunks, the last one cut at ``max_page_bytes``
+        """
+        received = 0
+        for chunk in chunks:
+            remaining = self.max_page_bytes - received
+            if len(chunk) > remaining:
+                logger.warning(f"Truncating {self.url} after {self.max_page_bytes} bytes")
+                chunk = chunk[:remaining]
+            received += len(chunk)
+            if reservation and self.chunk_size + received > reservation.reserved:
+                # Grow ahead of need so large pages resize only a few times
+                reservation.resize(self.chunk_size + min(2 * received, self.max_page_bytes))
+            yield chunk
+            if received >= self.max_page_bytes:
+                return
+
     def process_result(self) -> str:
         """
         Process the HTML content to extract meaningful text.
         
         This method removes non-content elements like scripts, styles,
-        headers, and footers, then extracts text from paragraphs.
+        headers, and footers, then extracts text from paragraphs. When the
+        domain has a learned template, only its container is scanned.
         
         Returns:
             Extracted text content or empty string if processing fails
@@ -94,9 +348,30 @@ class WebResultExtractor(ResultExtractor):
                 for element in soup.find_all(tag):
                     element.decompose()
             
+            # Go straight to the learned container when the domain has one
+            template = self.templates.lookup(self.url) if self.templates else None
+            counts = self._count_containers(soup) if self.templates else {}
+            if template:
+                # Repeated containers cannot be reduced to one, so scan fully
+                container = counts.get(template)
+                if container and container[1] == 1:
+                    text = '\n\n'.join(self._paragraph_texts(container[0]))
+                    if text:
+                        self.templates.record_hit(self.url)
+                        self.result = text
+                        return text
+            
             # Get paragraphs
-            paragraphs = soup.find_all('p')
-            text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 30])
+            kept = []
+            for p in soup.find_all('p'):
+                p_text = p.get_text(strip=True)
+                if len(p_text) > 30:
+                    kept.append((p, p_text))
+            text = '\n\n'.join([p_text for _, p_text in kept])
+            
+            if self.templates:
+                observed = self._common_container(counts, [p for p, _ in kept])
+                self.templates.record_scan(self.url, observed, template_missed=template is not None)
             
             # If no paragraphs found, get body text
             if not text and soup.body:
@@ -110,4 +385,100 @@ class WebResultExtractor(ResultExtractor):
             return text
         except Exception as e:
             logger.error(f"Error parsing HTML from {self.url}: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+    @staticmethod
+    def _paragraph_texts(container) -> list:
+        """Get long enough paragraph texts inside a container element."""
+        texts = [p.get_text(strip=True) for p in container.find_all('p')]
+        return [text for text in texts if len(text) > 30]
+
+    @staticmethod
+    def _count_containers(soup) -> dict:
+        """Map each container selector on the page to [first element, occurrences] in one pass."""
+        counts = {}
+        for element in soup.find_all(True):
+            selector = container_selector(element.name, element.attrs)
+            if not selector:
+                continue
+            entry = counts.get(selector)
+            if entry:
+                entry[1] += 1
+            else:
+                counts[selector] = [element, 1]
+        return counts
+
+    @staticmethod
+    def _common_container(counts: dict, paragraphs) -> Optional[str]:
+        """Selector of the closest uniquely identifiable common ancestor of paragraphs."""
+        if not paragraphs:
+            return None
+        common = list(reversed(list(paragraphs[0].parents)))
+        for p in paragraphs[1:]:
+            ancestors = list(reversed(list(p.parents)))
+            size = 0
+            for mine, theirs in zip(common, ancestors):
+                if mine is not theirs:
+                    break
+                size += 1
+            del common[size:]
+        for element in reversed(common):
+            selector = container_selector(element.name, element.attrs)
+            if selector and selector in counts and counts[selector][1] == 1:
+                return selector
+        return None
+
+    def process_stream(self, chunks, encoding: Optional[str] = None) -> str:
+        """
+        Incrementally extract text from HTML delivered in chunks.
+        
+        Chunks are fed to an lxml event parser while they arrive, dropping
+        ignored subtrees on the fly and keeping only paragraph text. The
+        output matches ``process_result`` without building a full tree,
+        except for paragraphs containing block elements (see
+        ``_ParagraphTarget``).
+        With a learned domain template, only the template's container is
+        kept, unless the page repeats it or it holds no paragraphs.
+        
+        Args:
+            chunks: Iterable of raw HTML byte chunks
+            encoding: Character encoding of the document, if known
+            
+        Returns:
+            Extracted text content or empty string if processing fails
+            
+        Raises:
+            RequestException: If downloading the chunks fails, so the
+                request can be retried
+        """
+        try:
+            template = self.templates.lookup(self.url) if self.templates else None
+            target = _ParagraphTarget(self.ignore_tags, container=template)
+            parser = etree.HTMLParser(target=target, encoding=encoding)
+            
+            received = False
+            for chunk in chunks:
+                if chunk:
+                    parser.feed(chunk)
+                    received = True
+            
+            if not received:
+                self.result = ""
+                return ""
+            
+            text = parser.close()
+            container_text = target.container_text()
+            if container_text:
+                self.templates.record_hit(self.url)
+                text = container_text
+            elif self.templates:
+                self.templates.record_scan(
+                    self.url, target.main_container(), template_missed=template is not None
+                )
+            self.result = text
+            return text
+        except (BudgetExceeded, requests.RequestException):
+            raise  # Shedding and retries are handled by request_content
+        except Exception as e:
+            logger.error(f"Error parsing HTML stream from {self.url}: {e}")
+            return ""
@@ -0,0 +1,243 @@
+# ennchan_search_dev/ennchan_search/extractor/templates.py
+import os
+import json
+import atexit
+import logging
+import tempfile
+import threading
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+def container_selector(tag: str, attrib: Dict[str, Any]) -> Optional[str]:
+    """
+    Build a simple selector identifying a container element.
+
+    Elements with an id give ``tag#id``, elements with classes give
+    ``tag.class1.class2``. Elements with neither cannot be recognised
+    on other pages and return None.
+
+    Args:
+        tag: Element tag name
+        attrib: Element attributes (class may be a string or a list)
+
+    Returns:
+        Selector string or None
+    """
+    element_id = attrib.get('id')
+    if isinstance(element_id, str) and element_id.strip():
+        return f"{tag}#{element_id.strip()}"
+
+    classes = attrib.get('class')
+    if isinstance(classes, str):
+        classes = classes.split()
+    if classes:
+        return tag + ''.join(f".{name}" for name in classes)
+    return None
+
+def domain_of(url: str) -> str:
+    """Get the normalized domain used to key templates."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class ExtractionTemplateCache:
+    """
+    Learns the main-content container of each domain.
+
+    After a full scan of a page the selector of the container that held the
+    kept paragraphs is recorded. Once the same selector wins ``min_samples``
+    pages in a row it becomes the domain's template, and later pages go
+    straight to that container. Only selectors matching a single element
+    on the page are learned, so a template never drops repeated containers.
+
+    Templates and hit counters are persisted as JSON when a path is given,
+    whenever a template is learned and every ``save_every`` pages.
+    """
+
+    def __init__(self, path: Optional[str] = None, min_samples: int = 3, save_every: int = 50):
+        """
+        Initialize the template cache.
+
+        Args:
+            path: Optional JSON file used to persist templates across restarts
+            min_samples: Consecutive agreeing pages required to learn a template
+            save_every: Number of recorded pages between periodic saves
+        """
+        self.path = path
+        self.min_samples = min_samples
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self._domains: Dict[str, Dict[str, Any]] = {}
+        if path:
+            self._load()
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Get the learned container selector for the URL's domain."""
+        with self._lock:
+            entry = self._domains.get(domain_of(url))
+            return entry["selector"] if entry else None
+
+    def set_template(self, domain: str, selector: Optional[str]):
+        """
+        Set or clear the template of a domain directly.
+
+        Args:
+            domain: Domain to configure (a URL is accepted too)
+            selector: Container selector, or None to forget the template
+        """
+        if "://" in domain:
+            domain = domain_of(domain)
+        with self._lock:
+            entry = self._entry(domain)
+            entry["selector"] = selector
+            entry["candidate"] = selector
+            entry["streak"] = self.min_samples if selector else 0
+        self.save()
+
+    def record_hit(self, url: str):
+        """Record a page extracted through its domain's template."""
+        with self._lock:
+            entry = self._entry(domain_of(url))
+            entry["pages"] += 1
+            entry["hits"] += 1
+        self._page_recorded()
+
+    def record_scan(self, url: str, observed: Optional[str], template_missed: bool = False):
+        """
+        Record a page that needed a full scan and learn from it.
+
+        Args:
+            url: URL of the page
+            observed: Selector of the container holding the kept paragraphs
+            template_missed: Whether a template was tried and missed first
+        """
+        learned = False
+        with self._lock:
+            entry = self._entry(domain_of(url))
+            entry["pages"] += 1
+            if template_missed:
+                entry["misses"] += 1
+
+            if observed and observed == entry["candidate"]:
+                entry["streak"] += 1
+            else:
+                entry["candidate"] = observed
+                entry["streak"] = 1 if observed else 0
+
+            if observed and entry["streak"] >= self.min_samples and entry["selector"] != observed:
+                logger.info(f"Learned extraction template {observed} for {domain_of(url)}")
+                entry["selector"] = observed
+                learned = True
+
+        if learned:
+            self.save()
+        else:
+            self._page_recorded()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-domain template metrics.
+
+        Returns:
+            Mapping of domain to its selector, page count, hits, misses
+            and hit rate
+        """
+        with self._lock:
+            return {
+                domain: {
+                    "selector": entry["selector"],
+                    "pages": entry["pages"],
+                    "hits": entry["hits"],
+                    "misses": entry["misses"],
+                    "hit_rate": entry["hits"] / entry["pages"] if entry["pages"] else 0.0,
+                }
+                for domain, entry in self._domains.items()
+            }
+
+    def save(self):
+        """Persist templates to the cache file, if one is configured."""
+        if not self.path:
+            return
+        # A unique temporary file per save keeps concurrent writers apart,
+        # and snapshotting under the save lock keeps saves in order
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self._domains, indent=2)
+                self._unsaved = 0
+            directory = os.path.dirname(os.path.abspath(self.path))
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=directory, prefix=os.path.basename(self.path), suffix=".tmp"
+                )
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Error saving extraction templates to {self.path}: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
+    def _page_recorded(self):
+        """Save periodically so hit rates survive restarts."""
+        if not self.path:
+            return
+        with self._lock:
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def _load(self):
+        """Load persisted templates, starting empty if none are readable."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable extraction templates at {self.path}: {e}")
+            return
+
+        for domain, entry in data.items():
+            if isinstance(entry, dict):
+                self._entry(domain).update(entry)
+        logger.info(f"Loaded extraction templates for {len(self._domains)} domains")
+
+    def _entry(self, domain: str) -> Dict[str, Any]:
+        """Get or create the stored entry for a domain."""
+        entry = self._domains.get(domain)
+        if entry is None:
+            entry = {
+                "selector": None,
+                "candidate": None,
+                "streak": 0,
+                "pages": 0,
+                "hits": 0,
+                "misses": 0,
+            }
+            self._domains[domain] = entry
+        return entry
+
+
+_default_cache: Optional[ExtractionTemplateCache] = None
+_default_cache_lock = threading.Lock()
+
+def default_template_cache() -> ExtractionTemplateCache:
+    """
+    Get the process-wide template cache.
+
+    The cache is persisted to the path in the ENNCHAN_TEMPLATE_CACHE
+    environment variable, or kept in memory when it is unset. It is also
+    saved when the interpreter exits.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ExtractionTemplateCache(os.environ.get("ENNCHAN_TEMPLATE_CACHE"))
+            atexit.register(_default_cache.save)
+        return _default_cache
@@ -0,0 +1,349 @@
+# ennchan_search_dev/ennchan_search/server.py
+import json
+import socket
+import logging
+import threading
+import concurrent.futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Union, List, Any, Iterator, Tuple
+
+from ennchan_search.core.model import BraveSearchEngine
+from ennchan_search.config import Config
+from ennchan_search.utils.memory_budget import configure_byte_budget
+
+logger = logging.getLogger(__name__)
+
+class SearchService:
+    """
+    Long-lived search service backed by one warm engine.
+
+    The engine, its HTTP connection pool and the worker pool used for
+    batch requests are created once and shared by every request. Admission
+    control rejects work once too many requests are already pending.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Union[str, Dict, Config]] = None,
+        max_pending: int = 32,
+        batch_workers: int = 4,
+        memory_budget: Optional[int] = None
+    ):
+        """
+        Initialize the search service.
+
+        Args:
+            config: Configuration passed to BraveSearchEngine
+            max_pending: Maximum number of requests processed at once
+            batch_workers: Number of queries of a batch run concurrently
+            memory_budget: Capacity in bytes to set on the process-wide byte
+                budget, or None to keep its current capacity
+
+        Raises:
+            ValueError: If memory_budget is not positive
+        """
+        if memory_budget is not None:
+            configure_byte_budget(memory_budget)
+        self.engine = BraveSearchEngine(config)
+        self.max_pending = max_pending
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=batch_workers)
+        self._admission = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+
+    def try_admit(self) -> bool:
+        """Reserve a request slot, returning False when overloaded."""
+        if not self._admission.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            self._pending += 1
+        return True
+
+    def release(self):
+        """Release a slot reserved by try_admit."""
+        with self._lock:
+            self._pending -= 1
+        self._admission.release()
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Search a single query with the warm engine."""
+        return self.engine.search(query)
+
+    def iter_batch(self, queries: List[str]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Search several queries concurrently.
+
+        Args:
+            queries: Queries to search
+
+        Yields:
+            (query, results) pairs in completion order
+        """
+        future_to_query = {
+            self.executor.submit(self.engine.search, query): query
+            for query in queries
+        }
+        for future in concurrent.futures.as_completed(future_to_query):
+            query = future_to_query[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"Batch search failed for {query}: {e}")
+                results = []
+            yield query, results
+
+    def stats(self) -> Dict[str, Any]:
+        """Get service and engine metrics."""
+        with self._lock:
+            service = {
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "rejected": self._rejected,
+            }
+        return {
+            "service": service,
+            "coalescing": self.engine.coalescing_stats(),
+            "memory": self.engine.memory_stats(),
+            "templates": self.engine.template_stats(),
+        }
+
+    def close(self):
+        """Wait for running batch work, persist templates and release shared pools."""
+        self.executor.shutdown(wait=True)
+        self.engine.templates.save()
+        self.engine.session.close()
+
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler exposing the search service.
+
+    Endpoints:
+        GET  /health  Liveness check
+        GET  /stats   Service, coalescing, memory and template metrics
+        POST /search  {"query": str} -> {"query": str, "results": [...]}
+        POST /batch   {"queries": [str]} -> {"results": {query: [...]}}
+        POST /stream  {"queries": [str]} -> NDJSON line per finished query
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are closed after this many seconds
+    timeout = 60
+    max_body_bytes = 1024 * 1024
+    service: SearchService = None
+
+    def handle_one_request(self):
+        """Handle one request, marking the connection idle while waiting for it."""
+        self.server.set_idle(self.connection, True)
+        try:
+            super().handle_one_request()
+        finally:
+            self.server.set_idle(self.connection, False)
+
+    def parse_request(self) -> bool:
+        """Mark the connection busy once a request line has arrived."""
+        self.server.set_idle(self.connection, False)
+        return super().parse_request()
+
+    def end_headers(self):
+        """Ask clients to disconnect once the server is shutting down."""
+        if self.server.shutting_down and not self.close_connection:
+            self.send_header("Connection", "close")
+        super().end_headers()
+
+    def finish(self):
+        """Forget the connection when it closes."""
+        self.server.set_idle(self.connection, False)
+        super().finish()
+
+    def log_message(self, format: str, *args: Any):
+        """Route access logs through the module logger."""
+        logger.info(f"{self.address_string()} - {format % args}")
+
+    def do_GET(self):
+        """Handle health and metrics requests."""
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(200, self.service.stats())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        """Handle search, batch and streaming requests."""
+        routes = {
+            "/search": self._handle_search,
+            "/batch": self._handle_batch,
+            "/stream": self._handle_stream,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self._reject(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._reject(400, {"error": "Invalid Content-Length"})
+            return
+        if length > self.max_body_bytes:
+            self._reject(413, {"error": "Request body too large"})
+            return
+
+        if not self.service.try_admit():
+            self._reject(503, {"error": "Server overloaded"}, {"Retry-After": "1"})
+            return
+
+        try:
+            body = self._read_json(length)
+        except ValueError as e:
+            self.service.release()
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        try:
+            handler(body)
+        except Exception as e:
+            logger.error(f"Error handling {self.path}: {e}")
+            self._send_json(500, {"error": "Internal server error"})
+        finally:
+            self.service.release()
+
+    def _handle_search(self, body: Dict[str, Any]):
+        """Search one query and return all results."""
+        query = body.get("query")
+        if not isinstance(query, str):
+            self._send_json(400, {"error": "'query' must be a string"})
+            return
+        self._send_json(200, {"query": query, "results": self.service.search(query)})
+
+    def _handle_batch(self, body: Dict[str, Any]):
+        """Search several queries and return all results at once."""
+        queries = self._get_queries(body)
+        if queries is None:
+            return
+        results = dict(self.service.iter_batch(queries))
+        self._send_json(200, {"results": results})
+
+    def _handle_stream(self, body: Dict[str, Any]):
+        """Stream each query's results as NDJSON as soon as it finishes."""
+        queries = self._get_queries(body)
+        if queries is None:
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        for query, results in self.service.iter_batch(queries):
+            line = json.dumps({"query": query, "results": results}) + "\n"
+            self._write_chunk(line.encode("utf-8"))
+        self._write_chunk(b"")
+
+    def _get_queries(self, body: Dict[str, Any]) -> Optional[List[str]]:
+        """Validate the queries of a batch body, replying 400 if invalid."""
+        queries = body.get("queries")
+        if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+            self._send_json(400, {"error": "'queries' must be a list of strings"})
+            return None
+        return queries
+
+    def _read_json(self, length: int) -> Dict[str, Any]:
+        """Read and decode a JSON request body of a validated length."""
+        data = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+        return data
+
+    def _reject(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """Reply without reading the body, closing the connection to stay in sync."""
+        self.close_connection = True
+        self._send_json(status, payload, dict(headers or {}, Connection="close"))
+
+    def _write_chunk(self, data: bytes):
+        """Write one chunk using chunked transfer encoding."""
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """Send a complete JSON response."""
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class SearchHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server that can close idle keep-alive connections.
+
+    Request threads are joined on close so in-flight requests finish, while
+    connections waiting for their next request are shut down so they do
+    not hold shutdown up.
+    """
+
+    daemon_threads = False
+    block_on_close = True
+
+    def __init__(self, server_address, handler_class):
+        super().__init__(server_address, handler_class)
+        self.shutting_down = False
+        self._idle_lock = threading.Lock()
+        self._idle_connections = set()
+
+    def set_idle(self, connection: socket.socket, idle: bool):
+        """Track whether a connection is waiting for its next request."""
+        with self._idle_lock:
+            if not idle:
+                self._idle_connections.discard(connection)
+                return
+            if not self.shutting_down:
+                self._idle_connections.add(connection)
+                return
+        self._close_connection(connection)
+
+    def close_idle_connections(self):
+        """Start shutting down: close idle connections and any that become idle."""
+        with self._idle_lock:
+            self.shutting_down = True
+            idle, self._idle_connections = self._idle_connections, set()
+        for connection in idle:
+            self._close_connection(connection)
+
+    @staticmethod
+    def _close_connection(connection: socket.socket):
+        """Unblock a handler waiting on the connection so it exits."""
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def create_server(
+    service: SearchService,
+    host: str = "127.0.0.1",
+    port: int = 8080
+) -> SearchHTTPServer:
+    """
+    Create an HTTP server bound to a search service.
+
+    Args:
+        service: The warm search service to expose
+        host: Interface to bind
+        port: Port to bind, 0 for any free port
+
+    Returns:
+        Server ready for serve_forever()
+    """
+    handler = type("BoundSearchRequestHandler", (SearchRequestHandler,), {"service": service})
+    return SearchHTTPServer((host, port), handler)
@@ -2,3 +2,7 @@
 """Utility functions for the search module."""
 
 from ennchan_search.utils.error_handling import retry_with_backoff, safe_dict_get
+from ennchan_search.utils.single_flight import SingleFlight
+from ennchan_search.utils.memory_budget import (
+    ByteBudget, BudgetExceeded, default_byte_budget, configure_byte_budget
+)
@@ -0,0 +1,210 @@
+# ennchan_search_dev/ennchan_search/utils/memory_budget.py
+import os
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+class BudgetExceeded(RuntimeError):
+    """Raised when bytes could not be reserved before the wait timed out."""
+
+
+class ByteBudget:
+    """
+    Process-wide budget of page bytes held in flight.
+
+    Fetches reserve bytes before downloading and release them when they
+    finish. Once the budget is full, further reservations block until
+    bytes are released, or are shed with BudgetExceeded after ``timeout``.
+    """
+
+    def __init__(self, capacity: int, timeout: Optional[float] = 30.0):
+        """
+        Initialize the byte budget.
+
+        Args:
+            capacity: Maximum number of bytes reserved at once
+            timeout: Seconds to wait for free bytes before shedding,
+                or None to wait indefinitely
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._peak = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._shed = 0
+
+    def acquire(self, nbytes: int, timeout: Any = _UNSET) -> int:
+        """
+        Reserve bytes, blocking while the budget is full.
+
+        Requests larger than the whole budget are capped to its capacity so
+        that a single large page can still proceed on its own.
+
+        Args:
+            nbytes: Number of bytes to reserve
+            timeout: Override for the budget's wait timeout
+
+        Returns:
+            Number of bytes actually reserved
+
+        Raises:
+            BudgetExceeded: If the bytes did not become free in time
+        """
+        nbytes = max(0, min(nbytes, self.capacity))
+        if timeout is _UNSET:
+            timeout = self.timeout
+
+        with self._cond:
+            if self._in_use + nbytes > self.capacity:
+                self._waits += 1
+                started = time.monotonic()
+                available = self._cond.wait_for(
+                    lambda: self._in_use + nbytes <= self.capacity, timeout
+                )
+                self._wait_seconds += time.monotonic() - started
+                if not available:
+                    self._shed += 1
+                    raise BudgetExceeded(
+                        f"Could not reserve {nbytes} bytes within {timeout}s "
+                        f"({self._in_use}/{self.capacity} bytes in use)"
+                    )
+            self._in_use += nbytes
+            self._peak = max(self._peak, self._in_use)
+        return nbytes
+
+    def try_acquire(self, nbytes: int) -> bool:
+        """Reserve bytes only if they are free right now, without waiting."""
+        nbytes = max(0, min(nbytes, self.capacity))
+        with self._cond:
+            if self._in_use + nbytes > self.capacity:
+                return False
+            self._in_use += nbytes
+            self._peak = max(self._peak, self._in_use)
+        return True
+
+    def set_capacity(self, capacity: int):
+        """Change the budget size, waking waiters if it grew."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        with self._cond:
+            self.capacity = capacity
+            self._cond.notify_all()
+
+    def release(self, nbytes: int):
+        """Return reserved bytes to the budget and wake waiters."""
+        if nbytes <= 0:
+            return
+        with self._cond:
+            self._in_use = max(0, self._in_use - nbytes)
+            self._cond.notify_all()
+
+    def reservation(self) -> "Reservation":
+        """Create an empty reservation that releases its bytes on exit."""
+        return Reservation(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get budget gauges.
+
+        Returns:
+            Dictionary with capacity, bytes in use, peak usage, number of
+            waits, total seconds spent waiting and shed reservations
+        """
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "in_use": self._in_use,
+                "peak": self._peak,
+                "waits": self._waits,
+                "wait_seconds": self._wait_seconds,
+                "shed": self._shed,
+            }
+
+
+class Reservation:
+    """
+    Bytes held from a ByteBudget by one fetch.
+
+    A reservation never waits while holding bytes: when it has to grow and
+    the extra bytes are not free, it releases what it holds first and then
+    waits for the full amount. This keeps concurrent fetches from filling
+    the budget and waiting on each other. Everything is released when used
+    as a context manager exits.
+    """
+
+    def __init__(self, budget: ByteBudget):
+        """
+        Initialize an empty reservation.
+
+        Args:
+            budget: Budget to reserve bytes from
+        """
+        self.budget = budget
+        self.reserved = 0
+
+    def resize(self, nbytes: int):
+        """Grow or shrink the reservation to nbytes (capped at capacity)."""
+        nbytes = max(0, min(nbytes, self.budget.capacity))
+        if nbytes <= self.reserved:
+            self.budget.release(self.reserved - nbytes)
+            self.reserved = nbytes
+        elif self.budget.try_acquire(nbytes - self.reserved):
+            self.reserved = nbytes
+        else:
+            self.release()
+            self.reserved = self.budget.acquire(nbytes)
+
+    def release(self):
+        """Release all reserved bytes."""
+        self.budget.release(self.reserved)
+        self.reserved = 0
+
+    def __enter__(self) -> "Reservation":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+_default_budget: Optional[ByteBudget] = None
+_default_budget_lock = threading.Lock()
+
+def default_byte_budget() -> ByteBudget:
+    """
+    Get the process-wide byte budget.
+
+    The capacity is read from the ENNCHAN_MEMORY_BUDGET environment
+    variable in bytes and defaults to 256 MiB.
+    """
+    global _default_budget
+    with _default_budget_lock:
+        if _default_budget is None:
+            capacity = int(os.environ.get("ENNCHAN_MEMORY_BUDGET", 256 * 1024 * 1024))
+            _default_budget = ByteBudget(capacity)
+        return _default_budget
+
+def configure_byte_budget(capacity: int) -> ByteBudget:
+    """
+    Set the capacity of the process-wide byte budget.
+
+    Args:
+        capacity: Maximum number of bytes reserved at once
+
+    Returns:
+        The process-wide budget
+
+    Raises:
+        ValueError: If capacity is not positive
+    """
+    budget = default_byte_budget()
+    budget.set_capacity(capacity)
+    return budget
@@ -0,0 +1,153 @@
+# ennchan_search_dev/ennchan_search/utils/single_flight.py
+import logging
+import threading
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Hashable, TypeVar, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share the same key.
+
+    The first caller for a key runs the operation; callers arriving while
+    it is still in flight wait for it and share its result or exception.
+    Once the operation finishes the key is released, so later calls run
+    again (this is not a cache).
+
+    The operation runs in the first caller's thread and cannot be
+    interrupted, but waiters can give up: they stop waiting after
+    ``timeout`` seconds, and ``cancel`` releases every waiter of a key with
+    CancelledError and lets the next caller start a fresh operation.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Initialize an empty set of in-flight operations.
+
+        Args:
+            timeout: Seconds a waiter waits for the shared operation before
+                giving up with concurrent.futures.TimeoutError, or None to
+                wait indefinitely
+        """
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._calls = 0
+        self._executions = 0
+        self._coalesced = 0
+        self._timeouts = 0
+        self._cancelled = 0
+
+    def do(self, key: Hashable, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run func once for all concurrent callers using the same key.
+
+        Args:
+            key: Key identifying identical operations
+            func: The operation to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The result of the shared operation
+
+        Raises:
+            Exception: Whatever the shared operation raised
+            CancelledError: If a waiter's operation was cancelled or its
+                leader was interrupted
+            concurrent.futures.TimeoutError: If a waiter gave up after the
+                configured timeout
+        """
+        with self._lock:
+            self._calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                future.set_running_or_notify_cancel()
+                self._in_flight[key] = future
+                self._executions += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            logger.debug(f"Waiting on in-flight operation for {key!r}")
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                with self._lock:
+                    self._timeouts += 1
+                logger.warning(f"Gave up waiting on in-flight operation for {key!r}")
+                raise
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._settle(key, future, exception=e)
+            raise
+        except BaseException:
+            # KeyboardInterrupt/SystemExit only concern the leader's thread,
+            # waiters are released as cancelled instead of hanging
+            self._settle(key, future, exception=CancelledError())
+            raise
+        else:
+            self._settle(key, future, result=result)
+            return result
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel the in-flight operation for a key.
+
+        Current waiters are released with CancelledError and the key is
+        forgotten, so the next caller starts a new operation. The running
+        operation itself finishes in its own thread and its result is only
+        returned to the caller that started it.
+
+        Args:
+            key: Key of the operation to cancel
+
+        Returns:
+            True if an operation was in flight for the key
+        """
+        with self._lock:
+            future = self._in_flight.pop(key, None)
+            if future is None:
+                return False
+            self._cancelled += 1
+            future.set_exception(CancelledError())
+        return True
+
+    def _settle(self, key: Hashable, future: Future, result: Any = None,
+                exception: Optional[BaseException] = None):
+        """Release the key and complete its future, unless it was cancelled."""
+        with self._lock:
+            if self._in_flight.get(key) is not future:
+                # Cancelled: waiters were already released
+                return
+            del self._in_flight[key]
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dictionary with total calls, executed operations, coalesced
+            calls, waiters that timed out, cancelled operations and the
+            number of operations currently in flight
+        """
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "timeouts": self._timeouts,
+                "cancelled": self._cancelled,
+                "in_flight": len(self._in_flight),
+            }
@@ -1,6 +1,8 @@
 import pytest
+import requests
 from unittest.mock import patch, MagicMock
 from ennchan_search.extractor.extractorModel import WebResultExtractor
+from ennchan_search.utils.memory_budget import ByteBudget
 
 @pytest.fixture
 def mock_response():
@@ -40,4 +42,139 @@ def test_process_result():
     assert "Important paragraph 1" in result
     assert "Important paragraph 2" in result
     assert "Header content" not in result
-    assert "Footer content" not in result
\ No newline at end of file
+    assert "Footer content" not in result
+
+def test_process_stream_matches_process_result():
+    """Test that incremental parsing gives the same text as the full parse."""
+    html = """
+    <html>
+        <head><script>var x = 1;</script><style>.test{color:red;}</style></head>
+        <body>
+            <header>Header content</header>
+            <nav><p>Navigation paragraph long enough to be kept otherwise</p></nav>
+            <p>Important paragraph 1 with <b>enough</b> text to be kept</p>
+            <p>Too short</p>
+            <p>Important paragraph 2 with enough text to be kept</p>
+            <footer>Footer content</footer>
+        </body>
+    </html>
+    """
+    expected_extractor = WebResultExtractor("https://example.com")
+    expected_extractor.result = html
+    expected = expected_extractor.process_result()
+
+    data = html.encode("utf-8")
+    chunks = [data[i:i + 16] for i in range(0, len(data), 16)]
+    result = WebResultExtractor("https://example.com").process_stream(chunks, encoding="utf-8")
+
+    assert result == expected
+    assert "Navigation paragraph" not in result
+    assert "Too short" not in result
+
+def test_process_stream_falls_back_to_body_text():
+    """Test that pages without paragraphs fall back to body text."""
+    chunks = [b"<html><body><div>Only ", b"<span>div</span> text</div>", b"</body></html>"]
+
+    result = WebResultExtractor("https://example.com").process_stream(chunks)
+
+    assert result == "Only\ndiv\ntext"
+
+def test_process_stream_splits_text_around_comments():
+    """Test that comments separate strings like in process_result."""
+    chunks = [b"<html><body><div>Text<!-- c --> more</div></body></html>"]
+
+    result = WebResultExtractor("https://example.com").process_stream(chunks)
+
+    assert result == "Text\nmore"
+
+def test_process_stream_closes_paragraphs_at_block_elements():
+    """Test the documented difference for block elements inside paragraphs."""
+    html = (
+        b"<html><body><p>Outer paragraph that is long enough to keep it"
+        b"<p>Inner paragraph that is long enough to keep too</p></p>"
+        b"<p>Paragraph text that is long enough to keep"
+        b"<div>a nested block element inside</div></p></body></html>"
+    )
+
+    result = WebResultExtractor("https://example.com").process_stream([html])
+
+    assert result == (
+        "Outer paragraph that is long enough to keep it\n\n"
+        "Inner paragraph that is long enough to keep too\n\n"
+        "Paragraph text that is long enough to keep"
+    )
+
+def test_process_stream_propagates_download_errors():
+    """Test that a broken download is raised so it can be retried."""
+    def broken_chunks():
+        yield b"<html><body><p>Partial"
+        raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        WebResultExtractor("https://example.com").process_stream(broken_chunks())
+
+def test_request_content_reserves_page_once():
+    """Test that a fetch reserves its capped size once and releases it after parsing."""
+    budget = ByteBudget(10 * 1024 * 1024)
+    html = b"<html><body><p>" + b"x" * 50 + b"</p></body></html>"
+    response = MagicMock()
+    response.headers = {"Content-Length": str(len(html))}
+    response.encoding = "utf-8"
+    response.iter_content.return_value = iter([html[:20], html[20:]])
+    session = MagicMock()
+    session.get.return_value = response
+
+    extractor = WebResultExtractor("https://example.com", session=session, budget=budget)
+    result = extractor.request_content()
+
+    assert result == "x" * 50
+    stats = budget.stats()
+    assert stats["peak"] == extractor.chunk_size + len(html)
+    assert stats["in_use"] == 0
+
+@patch('ennchan_search.utils.error_handling.time.sleep')
+def test_request_content_closes_error_responses(mock_sleep):
+    """Test that a 4xx/5xx response is closed before the request is retried."""
+    response = MagicMock()
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("503 Server Error")
+    session = MagicMock()
+    session.get.return_value = response
+
+    extractor = WebResultExtractor("https://example.com", session=session)
+    with pytest.raises(requests.exceptions.HTTPError):
+        extractor.request_content()
+
+    assert session.get.call_count == 3
+    assert response.__exit__.call_count == 3
+
+def test_request_content_grows_reservation_with_parsed_bytes():
+    """Test that a body larger than its estimate is still fully accounted for."""
+    budget = ByteBudget(10 * 1024 * 1024)
+    html = b"<html><body><p>" + b"x" * 500 + b"</p></body></html>"
+    response = MagicMock()
+    # Compressed bodies report the encoded size in Content-Length
+    response.headers = {"Content-Length": "40", "Content-Encoding": "gzip"}
+    response.encoding = "utf-8"
+    response.iter_content.return_value = iter([html[i:i + 100] for i in range(0, len(html), 100)])
+    session = MagicMock()
+    session.get.return_value = response
+
+    extractor = WebResultExtractor("https://example.com", session=session, budget=budget)
+    extractor.page_estimate = 64
+    result = extractor.request_content()
+
+    assert result == "x" * 500
+    stats = budget.stats()
+    assert stats["peak"] >= extractor.chunk_size + len(html)
+    assert stats["in_use"] == 0
+
+def test_metered_chunks_stop_at_page_limit():
+    """Test that reading stops once the page limit has been parsed."""
+    extractor = WebResultExtractor("https://example.com", session=MagicMock())
+    extractor.max_page_bytes = 250
+    chunks = iter([b"a" * 100] * 5)
+
+    metered = list(extractor._metered_chunks(chunks))
+
+    assert metered == [b"a" * 100, b"a" * 100, b"a" * 50]
+    assert next(chunks) == b"a" * 100
@@ -11,4 +11,4 @@ def test_search_function(mock_search):
     
     assert len(results) == 1
     assert results[0]["title"] == "Test"
-    mock_search.assert_called_once_with("test query")
\ No newline at end of file
+    mock_search.assert_called_once_with("test query", lazy=False, prefetch=0)
\ No newline at end of file
@@ -0,0 +1,104 @@
+import threading
+import time
+import pytest
+from ennchan_search.utils.memory_budget import ByteBudget, BudgetExceeded
+
+def test_reservation_released_on_exit():
+    """Test that a reservation returns its bytes when it exits."""
+    budget = ByteBudget(100)
+
+    with budget.reservation() as reservation:
+        reservation.resize(40)
+        reservation.resize(70)
+        assert budget.stats()["in_use"] == 70
+
+    stats = budget.stats()
+    assert stats["in_use"] == 0
+    assert stats["peak"] == 70
+
+def test_oversized_request_is_capped():
+    """Test that a single request larger than the budget can still proceed."""
+    budget = ByteBudget(100)
+
+    assert budget.acquire(500) == 100
+    budget.release(100)
+
+def test_full_budget_sheds_after_timeout():
+    """Test that reservations are shed when the budget stays full."""
+    budget = ByteBudget(100, timeout=0.05)
+    budget.acquire(80)
+
+    with pytest.raises(BudgetExceeded):
+        budget.acquire(30)
+
+    stats = budget.stats()
+    assert stats["shed"] == 1
+    assert stats["waits"] == 1
+    assert stats["wait_seconds"] > 0
+
+def test_waiter_proceeds_after_release():
+    """Test that a blocked reservation proceeds once bytes are released."""
+    budget = ByteBudget(100, timeout=5)
+    budget.acquire(80)
+    acquired = []
+
+    thread = threading.Thread(target=lambda: acquired.append(budget.acquire(50)))
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired
+
+    budget.release(80)
+    thread.join()
+
+    assert acquired == [50]
+    assert budget.stats()["in_use"] == 50
+
+def test_resize_shrinks_reservation():
+    """Test that resizing below the reserved amount releases the difference."""
+    budget = ByteBudget(100)
+
+    with budget.reservation() as reservation:
+        reservation.resize(60)
+        reservation.resize(20)
+        assert budget.stats()["in_use"] == 20
+
+def test_growing_reservations_do_not_wait_on_each_other():
+    """Test that a reservation waiting to grow holds no bytes meanwhile."""
+    budget = ByteBudget(1000, timeout=1)
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def fetch():
+        try:
+            with budget.reservation() as reservation:
+                reservation.resize(250)
+                barrier.wait()
+                reservation.resize(400)
+                time.sleep(0.01)
+        except BudgetExceeded as e:
+            errors.append(e)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=fetch) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert time.monotonic() - started < 1
+    assert budget.stats()["in_use"] == 0
+
+def test_set_capacity_wakes_waiters():
+    """Test that growing the budget lets blocked reservations proceed."""
+    budget = ByteBudget(100, timeout=5)
+    budget.acquire(100)
+    acquired = []
+
+    thread = threading.Thread(target=lambda: acquired.append(budget.acquire(50)))
+    thread.start()
+    time.sleep(0.05)
+    budget.set_capacity(200)
+    thread.join()
+
+    assert acquired == [50]
@@ -1,6 +1,9 @@
+import threading
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from ennchan_search.core.model import BraveSearchEngine
+from ennchan_search.utils.single_flight import SingleFlight
 
 @pytest.fixture
 def mock_config():
@@ -47,4 +50,90 @@ def test_search_method(mock_brave, mock_extractor, mock_config, mock_brave_respo
     assert len(results) == 1
     assert results[0]["title"] == "Test Title"
     assert results[0]["url"] == "https://example.com"
-    assert "content" in results[0]
\ No newline at end of file
+    assert "content" in results[0]
+
+@patch('ennchan_search.core.model.WebResultExtractor')
+@patch('ennchan_search.core.model.Brave')
+def test_lazy_search_fetches_on_access(mock_brave, mock_extractor, mock_config, mock_brave_response):
+    """Test that lazy search only fetches content when it is read."""
+    mock_brave_instance = MagicMock()
+    mock_brave_instance.search.return_value = mock_brave_response
+    mock_brave.return_value = mock_brave_instance
+    mock_extractor.return_value.request_content.return_value = "Test Content"
+
+    engine = BraveSearchEngine(mock_config)
+    results = engine.search("lazy test query", lazy=True)
+
+    assert len(results) == 1
+    assert results[0]["description"] == "Test Description"
+    mock_extractor.assert_not_called()
+
+    assert results[0]["content"] == "Test Content"
+    assert results[0].content == "Test Content"
+    mock_extractor.assert_called_once()
+
+@patch.object(BraveSearchEngine, '_extract_flight', new_callable=SingleFlight)
+@patch.object(BraveSearchEngine, '_search_flight', new_callable=SingleFlight)
+@patch('ennchan_search.core.model.WebResultExtractor')
+@patch('ennchan_search.core.model.Brave')
+def test_concurrent_searches_are_coalesced(mock_brave, mock_extractor, search_flight,
+                                           extract_flight, mock_config, mock_brave_response):
+    """Test that identical concurrent searches share one Brave call and fetch."""
+    release = threading.Event()
+
+    def slow_search(**kwargs):
+        release.wait(5)
+        return mock_brave_response
+
+    mock_brave.return_value.search.side_effect = slow_search
+    mock_extractor.return_value.request_content.return_value = "Test Content"
+    engine = BraveSearchEngine(mock_config)
+
+    outcomes = []
+    queries = ["test query", "Test  Query", "TEST query"]
+    threads = [
+        threading.Thread(target=lambda q=q: outcomes.append(engine.search(q)))
+        for q in queries
+    ]
+    for thread in threads:
+        thread.start()
+    while engine.coalescing_stats()["search"]["calls"] < len(queries):
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert mock_brave.return_value.search.call_count == 1
+    assert mock_extractor.call_count == 1
+    assert [len(results) for results in outcomes] == [1, 1, 1]
+    assert outcomes[0] is not outcomes[1]
+    stats = engine.coalescing_stats()
+    assert stats["search"]["executions"] == 1
+    assert stats["search"]["coalesced"] == 2
+    assert stats["extract"]["executions"] == 1
+
+@patch.object(BraveSearchEngine, '_extract_flight', new_callable=SingleFlight)
+@patch('ennchan_search.core.model.WebResultExtractor')
+@patch('ennchan_search.core.model.Brave')
+def test_concurrent_extractions_are_coalesced(mock_brave, mock_extractor, extract_flight, mock_config):
+    """Test that concurrent extractions of one URL share a single fetch."""
+    release = threading.Event()
+    mock_extractor.return_value.request_content.side_effect = lambda: release.wait(5) and "Test Content"
+    engine = BraveSearchEngine(mock_config)
+
+    outcomes = []
+    threads = [
+        threading.Thread(target=lambda: outcomes.append(engine.extract_content("https://example.com")))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while engine.coalescing_stats()["extract"]["calls"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes == ["Test Content"] * 3
+    assert mock_extractor.call_count == 1
+    assert engine.coalescing_stats()["extract"]["coalesced"] == 2
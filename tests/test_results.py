@@ -0,0 +1,99 @@
+import concurrent.futures
+import copy
+import json
+import pickle
+from unittest.mock import MagicMock
+from ennchan_search.core.results import LazyContent, LazyResult
+
+def _lazy(fetch):
+    return LazyResult({"title": "Test", "url": "https://example.com"}, LazyContent(fetch, "https://example.com"))
+
+def test_content_is_fetched_once_on_access():
+    """Test that content is fetched on first access and then reused."""
+    fetch = MagicMock(return_value="Test Content")
+    result = _lazy(fetch)
+
+    assert result["title"] == "Test"
+    assert not result.resolved
+    fetch.assert_not_called()
+
+    assert result.get("content") == "Test Content"
+    assert result["content"] == "Test Content"
+    assert result.resolved
+    fetch.assert_called_once_with("https://example.com")
+
+def test_copies_share_content():
+    """Test that copies of a lazy result share one fetch."""
+    fetch = MagicMock(return_value="Test Content")
+    result = _lazy(fetch)
+    clone = result.copy()
+
+    assert isinstance(clone, LazyResult)
+    assert clone.content == "Test Content"
+    assert result.content == "Test Content"
+    fetch.assert_called_once()
+
+def test_failed_fetch_gives_empty_content():
+    """Test that a failed extraction resolves to empty content."""
+    result = _lazy(MagicMock(return_value=None))
+
+    assert "content" in result
+    assert result.content == ""
+
+def test_prefetch_resolves_in_background():
+    """Test that prefetching resolves content before it is read."""
+    fetch = MagicMock(return_value="Test Content")
+    result = _lazy(fetch)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        result.prefetch(executor)
+
+    assert result.resolved
+    assert result.content == "Test Content"
+    fetch.assert_called_once()
+
+def test_prefetch_submits_one_fetch():
+    """Test that repeated prefetches do not occupy more than one worker."""
+    fetch = MagicMock(return_value="Test Content")
+    result = _lazy(fetch)
+    clones = [result.copy() for _ in range(3)]
+    executor = MagicMock()
+
+    for clone in clones:
+        clone.prefetch(executor)
+    result.prefetch(executor)
+
+    assert executor.submit.call_count == 1
+    assert not result.resolved
+    task, *args = executor.submit.call_args[0]
+    task(*args)
+    assert all(clone.content == "Test Content" for clone in clones)
+    fetch.assert_called_once()
+
+def test_content_is_a_key_for_every_access_path():
+    """Test that iteration and serialisation include the lazily fetched content."""
+    fetch = MagicMock(return_value="Test Content")
+    result = _lazy(fetch)
+
+    assert list(result) == ["title", "url", "content"]
+    assert len(result) == 3
+    fetch.assert_not_called()
+
+    assert json.loads(json.dumps(_lazy(fetch)))["content"] == "Test Content"
+    assert dict(result) == {"title": "Test", "url": "https://example.com", "content": "Test Content"}
+    assert result == {"title": "Test", "url": "https://example.com", "content": "Test Content"}
+
+def test_deepcopy_and_pickle():
+    """Test that lazy results can be deep-copied and pickled."""
+    fetch = MagicMock(return_value="Test Content")
+    result = _lazy(fetch)
+
+    clone = copy.deepcopy(result)
+    assert isinstance(clone, LazyResult)
+    fetch.assert_not_called()
+    assert clone.content == "Test Content"
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert type(restored) is dict
+    assert restored["content"] == "Test Content"
+    fetch.assert_called_once()
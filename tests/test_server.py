@@ -0,0 +1,124 @@
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from unittest.mock import patch
+from ennchan_search.cli import main
+from ennchan_search.server import SearchService, create_server
+from ennchan_search.utils.memory_budget import default_byte_budget
+
+@pytest.fixture
+def running_server():
+    with patch('ennchan_search.core.model.Brave'):
+        service = SearchService({"BRAVE_API_KEY": "test_key"}, max_pending=1)
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield service, "http://127.0.0.1:%d" % server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    service.close()
+    thread.join()
+
+def _post(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return response.read().decode("utf-8")
+
+def test_search_endpoint(running_server):
+    """Test that /search returns results from the warm engine."""
+    service, base_url = running_server
+    with patch.object(service.engine, 'search', return_value=[{"title": "Test"}]):
+        body = json.loads(_post(base_url + "/search", {"query": "test query"}))
+
+    assert body == {"query": "test query", "results": [{"title": "Test"}]}
+
+def test_stream_endpoint(running_server):
+    """Test that /stream emits one NDJSON line per query."""
+    service, base_url = running_server
+    with patch.object(service.engine, 'search', side_effect=lambda q: [{"title": q}]):
+        lines = _post(base_url + "/stream", {"queries": ["a", "b"]}).splitlines()
+
+    results = {line["query"]: line["results"] for line in map(json.loads, lines)}
+    assert results == {"a": [{"title": "a"}], "b": [{"title": "b"}]}
+
+def test_overloaded_service_rejects_requests(running_server):
+    """Test that requests beyond max_pending are rejected with 503."""
+    service, base_url = running_server
+    assert service.try_admit()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            _post(base_url + "/search", {"query": "test query"})
+    finally:
+        service.release()
+
+    assert excinfo.value.code == 503
+    assert service.stats()["service"]["rejected"] == 1
+
+def test_shutdown_closes_idle_keep_alive_connections():
+    """Test that an idle keep-alive client does not block server shutdown."""
+    with patch('ennchan_search.core.model.Brave'):
+        service = SearchService({"BRAVE_API_KEY": "test_key"})
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    connection.request("GET", "/health")
+    assert connection.getresponse().read() == b'{"status": "ok"}'
+
+    closer = threading.Thread(target=lambda: (
+        server.close_idle_connections(), server.shutdown(), server.server_close()
+    ))
+    closer.start()
+    closer.join(5)
+    try:
+        assert not closer.is_alive()
+    finally:
+        connection.close()
+        service.close()
+        thread.join()
+
+def test_invalid_content_length_is_rejected(running_server):
+    """Test that bad or oversized bodies are rejected before reading them."""
+    _, base_url = running_server
+    host, port = base_url[len("http://"):].split(":")
+
+    for length, status in (("-1", 400), (str(10 * 1024 * 1024), 413)):
+        connection = http.client.HTTPConnection(host, int(port))
+        connection.putrequest("POST", "/search")
+        connection.putheader("Content-Length", length)
+        connection.endheaders()
+        response = connection.getresponse()
+        assert response.status == status
+        assert response.getheader("Connection") == "close"
+        connection.close()
+
+def test_memory_budget_configures_shared_budget():
+    """Test that the service sizes the process-wide budget instead of a private one."""
+    budget = default_byte_budget()
+    original = budget.capacity
+    try:
+        with patch('ennchan_search.core.model.Brave'):
+            service = SearchService({"BRAVE_API_KEY": "test_key"}, memory_budget=1024)
+            with pytest.raises(ValueError):
+                SearchService({"BRAVE_API_KEY": "test_key"}, memory_budget=0)
+
+        assert service.engine.budget is budget
+        assert budget.capacity == 1024
+        service.close()
+    finally:
+        budget.set_capacity(original)
+
+@pytest.mark.parametrize("option", ["--max-pending", "--batch-workers", "--memory-budget"])
+def test_serve_rejects_non_positive_sizes(option):
+    """Test that sizes of zero are rejected before the service starts."""
+    with patch('ennchan_search.cli.serve') as serve:
+        with pytest.raises(SystemExit):
+            main(["serve", option, "0"])
+    serve.assert_not_called()
@@ -0,0 +1,155 @@
+import threading
+import time
+import pytest
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeoutError
+from ennchan_search.utils.single_flight import SingleFlight
+
+def _run_concurrently(flight, key, func, callers=5):
+    """Start callers on the same key and return their outcomes."""
+    outcomes = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            value = flight.do(key, func)
+        except Exception as e:
+            value = e
+        with lock:
+            outcomes.append(value)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+def test_concurrent_calls_are_coalesced():
+    """Test that concurrent callers share one execution and its result."""
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def slow():
+        executions.append(1)
+        release.wait(5)
+        return "shared"
+
+    threads, outcomes = _run_concurrently(flight, "key", slow)
+    while flight.stats()["calls"] < 5:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes == ["shared"] * 5
+    assert len(executions) == 1
+    assert flight.stats() == {
+        "calls": 5, "executions": 1, "coalesced": 4, "timeouts": 0, "cancelled": 0, "in_flight": 0
+    }
+
+def test_errors_propagate_to_waiters():
+    """Test that every coalesced caller sees the leader's exception."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, outcomes = _run_concurrently(flight, "key", failing, callers=3)
+    while flight.stats()["calls"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+
+def test_key_is_released_after_completion():
+    """Test that sequential calls are not cached."""
+    flight = SingleFlight()
+    counter = iter(range(10))
+
+    assert flight.do("key", lambda: next(counter)) == 0
+    assert flight.do("key", lambda: next(counter)) == 1
+    assert flight.stats()["coalesced"] == 0
+
+def test_waiter_gives_up_after_timeout():
+    """Test that waiters stop waiting after the configured timeout."""
+    flight = SingleFlight(timeout=0.05)
+    release = threading.Event()
+
+    threads, outcomes = _run_concurrently(flight, "key", lambda: release.wait(5) and "late", callers=2)
+    while len(outcomes) < 1:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert any(isinstance(outcome, FutureTimeoutError) for outcome in outcomes)
+    assert "late" in outcomes
+    assert flight.stats()["timeouts"] == 1
+
+def test_cancel_releases_waiters():
+    """Test that cancelling a key releases its waiters with CancelledError."""
+    flight = SingleFlight()
+    release = threading.Event()
+    outcomes = []
+
+    leader = threading.Thread(target=lambda: outcomes.append(flight.do("key", lambda: release.wait(5) and "done")))
+    leader.start()
+    while flight.stats()["in_flight"] < 1:
+        time.sleep(0.01)
+
+    waiter_outcome = []
+    def wait():
+        try:
+            flight.do("key", lambda: "unused")
+        except BaseException as e:
+            waiter_outcome.append(e)
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    while flight.stats()["coalesced"] < 1:
+        time.sleep(0.01)
+
+    assert flight.cancel("key")
+    waiter.join()
+    assert isinstance(waiter_outcome[0], CancelledError)
+
+    # The next caller starts a fresh operation
+    assert flight.do("key", lambda: "fresh") == "fresh"
+    release.set()
+    leader.join()
+    assert outcomes == ["done"]
+    assert flight.stats()["cancelled"] == 1
+
+def test_interrupted_leader_cancels_waiters():
+    """Test that a leader's KeyboardInterrupt is not raised in its waiters."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def interrupted():
+        release.wait(5)
+        raise KeyboardInterrupt
+
+    leader_outcome = []
+    def lead():
+        try:
+            flight.do("key", interrupted)
+        except BaseException as e:
+            leader_outcome.append(e)
+    leader = threading.Thread(target=lead)
+    leader.start()
+    while flight.stats()["in_flight"] < 1:
+        time.sleep(0.01)
+
+    threads, outcomes = _run_concurrently(flight, "key", lambda: "unused", callers=2)
+    while flight.stats()["coalesced"] < 2:
+        time.sleep(0.01)
+    release.set()
+    leader.join()
+    for thread in threads:
+        thread.join()
+
+    assert isinstance(leader_outcome[0], KeyboardInterrupt)
+    assert all(isinstance(outcome, CancelledError) for outcome in outcomes)
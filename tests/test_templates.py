@@ -0,0 +1,132 @@
+import os
+import tempfile
+import pytest
+from ennchan_search.extractor.extractorModel import WebResultExtractor
+from ennchan_search.extractor.templates import ExtractionTemplateCache, container_selector, domain_of
+
+PAGE = """
+<html><body>
+    <div class="sidebar"><span>Related links</span></div>
+    <div id="main">
+        <p>First paragraph of the article body with enough text.</p>
+        <div class="figure"><p>Second paragraph of the article body with enough text.</p></div>
+    </div>
+    <div class="comments"><p>A comment that is long enough to count as a paragraph.</p></div>
+</body></html>
+"""
+
+def _stream(extractor, html):
+    data = html.encode("utf-8")
+    return extractor.process_stream([data[i:i + 32] for i in range(0, len(data), 32)], encoding="utf-8")
+
+def test_container_selector():
+    """Test selectors built from element attributes."""
+    assert container_selector("div", {"id": "main", "class": "a"}) == "div#main"
+    assert container_selector("div", {"class": ["post", "body"]}) == "div.post.body"
+    assert container_selector("div", {"class": "post body"}) == "div.post.body"
+    assert container_selector("div", {}) is None
+    assert domain_of("https://www.Example.com/a") == "example.com"
+
+def test_template_learned_after_min_samples():
+    """Test that a domain template is learned from agreeing pages."""
+    cache = ExtractionTemplateCache(min_samples=2)
+    article = PAGE.replace('<div class="comments"><p>A comment that is long enough to count as a paragraph.</p></div>', '')
+
+    _stream(WebResultExtractor("https://example.com/1", templates=cache), article)
+    assert cache.lookup("https://example.com/2") is None
+    _stream(WebResultExtractor("https://example.com/2", templates=cache), article)
+
+    assert cache.lookup("https://example.com/3") == "div#main"
+
+def test_stream_uses_template():
+    """Test that a learned template limits output to its container."""
+    cache = ExtractionTemplateCache()
+    cache.set_template("example.com", "div#main")
+    extractor = WebResultExtractor("https://example.com/a", templates=cache)
+
+    result = _stream(extractor, PAGE)
+
+    assert "First paragraph" in result
+    assert "Second paragraph" in result
+    assert "comment" not in result
+    assert cache.stats()["example.com"]["hits"] == 1
+
+def test_process_result_falls_back_when_template_misses():
+    """Test that a missing container falls back to the full scan."""
+    cache = ExtractionTemplateCache()
+    cache.set_template("example.com", "div#missing")
+    extractor = WebResultExtractor("https://example.com/a", templates=cache)
+    extractor.result = PAGE
+
+    result = extractor.process_result()
+
+    assert "First paragraph" in result
+    assert "comment" in result
+    stats = cache.stats()["example.com"]
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.0
+
+def test_templates_persist_across_instances():
+    """Test that templates are saved and loaded from disk."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "templates.json")
+        cache = ExtractionTemplateCache(path, min_samples=1)
+        cache.record_scan("https://example.com/a", "div#main")
+
+        reloaded = ExtractionTemplateCache(path)
+
+        assert reloaded.lookup("https://example.com/b") == "div#main"
+        assert reloaded.stats()["example.com"]["pages"] == 1
+
+def test_repeated_containers_are_not_learned():
+    """Test that selectors matching several elements never become templates."""
+    cache = ExtractionTemplateCache(min_samples=1)
+    page = """
+    <html><body><div class="content">
+        <div class="post"><p>First post on the page with enough text to be kept.</p></div>
+        <div class="post"><p>Second post on the page with enough text to be kept.</p></div>
+    </div></body></html>
+    """
+    extractor = WebResultExtractor("https://example.com/1", templates=cache)
+    extractor.result = page
+
+    result = extractor.process_result()
+
+    assert "Second post" in result
+    assert cache.lookup("https://example.com/2") == "div.content"
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_repeated_template_container_is_a_miss(stream):
+    """Test that a template matching several elements keeps them all."""
+    cache = ExtractionTemplateCache()
+    cache.set_template("example.com", "div.post")
+    page = """
+    <html><body>
+        <div class="post"><p>First post on the page with enough text to be kept.</p></div>
+        <div class="post"><p>Second post on the page with enough text to be kept.</p></div>
+    </body></html>
+    """
+    extractor = WebResultExtractor("https://example.com/1", templates=cache)
+
+    if stream:
+        result = _stream(extractor, page)
+    else:
+        extractor.result = page
+        result = extractor.process_result()
+
+    assert "First post" in result
+    assert "Second post" in result
+    assert cache.stats()["example.com"]["misses"] == 1
+
+def test_hit_rates_are_saved_periodically():
+    """Test that hit counters are persisted without an explicit save."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "templates.json")
+        cache = ExtractionTemplateCache(path, save_every=2)
+        cache.record_hit("https://example.com/a")
+        cache.record_hit("https://example.com/b")
+
+        reloaded = ExtractionTemplateCache(path)
+
+        assert reloaded.stats()["example.com"]["hits"] == 2
+        assert os.listdir(tmp_dir) == ["templates.json"]